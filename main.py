@@ -1,42 +1,196 @@
 import sys
 import os
 import re
+import math
+import time
+import queue
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import configparser
+import hashlib
+import sqlite3
 import json
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional, stdlib json parses the same input
+    _json_loads = json.loads
 
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, 
     QPushButton, QProgressBar, QHBoxLayout, QCheckBox, QComboBox
 )
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QIcon
 
 os.makedirs("downloads", exist_ok=True)
 os.makedirs("locales", exist_ok=True)
 
-class Worker(QThread):
-    statusChanged = pyqtSignal(str)
-    progressUpdated = pyqtSignal(int, int)
-
+API_URL = "https://gelbooru.com/index.php"
+# Posts per API page (Gelbooru's maximum)
+PAGE_LIMIT = 100
+# Number of API pages fetched in parallel once the total is known
+PAGE_WORKERS = 8
+# Number of files downloaded in parallel
+DOWNLOAD_WORKERS = 16
+# Posts buffered between the page fetcher and the download loop
+POST_QUEUE_SIZE = 2000
+# Downloads submitted to the pool but not finished yet
+MAX_PENDING_DOWNLOADS = DOWNLOAD_WORKERS * 4
+# Distinct hosts (API + CDN mirrors) that keep a connection pool
+POOL_HOSTS = 8
+# Keep-alive connections kept per host: one per thread that can use it
+POOL_SIZE = max(DOWNLOAD_WORKERS, PAGE_WORKERS)
+IMAGE_EXTS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tga'})
+GIF_EXTS = frozenset({'.gif'})
+VIDEO_EXTS = frozenset({'.mp4', '.webm', '.avi', '.mov', '.swf'})
+_EXT_TO_SUBDIR = {
+    **dict.fromkeys(IMAGE_EXTS, "images"),
+    **dict.fromkeys(GIF_EXTS, "GIF"),
+    **dict.fromkeys(VIDEO_EXTS, "videos"),
+}
+# Characters not allowed in Windows filenames
+_INVALID_FN = re.compile(r'[<>:"/\\|?*]')
+DOWNLOAD_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Referer": "https://gelbooru.com/",
+}
+# Remembers finished downloads across runs
+INDEX_PATH = os.path.join("downloads", ".index.sqlite")
+# Index rows written per transaction
+INDEX_COMMIT_EVERY = 100
+# Minimum seconds between progress updates sent to the GUI
+UPDATE_INTERVAL = 0.1
+# How often (ms) the GUI drains engine updates, and how many it takes per tick
+DRAIN_INTERVAL_MS = 100
+MAX_UPDATES_PER_DRAIN = 500
+# Seconds the closing window waits for the engine to save the index and finish
+STOP_TIMEOUT = 2
+# Read block size for file downloads
+CHUNK_SIZE = 256 * 1024
+# Chunks are read into a buffer of this size, which is written with one syscall when full
+WRITE_BATCH = 1 << 20
+
+
+_thread_local = threading.local()
+
+
+def _write_buffer():
+    # One reusable buffer per download thread instead of a fresh bytes object per chunk
+    buf = getattr(_thread_local, "buf", None)
+    if buf is None:
+        buf = _thread_local.buf = memoryview(bytearray(WRITE_BATCH))
+    return buf
+
+
+def _write_all(fd, view):
+    # os.write may write less than asked (disk full, signals), keep going until it's all out
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _save_stream(raw, filepath, append=False, stop=None):
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    flags |= os.O_APPEND if append else os.O_TRUNC
+    fd = os.open(filepath, flags, 0o644)
+    try:
+        buf = _write_buffer()
+        filled = 0
+        while True:
+            if stop is not None and stop.is_set():
+                # Flush what was read so the .part file resumes from the right place
+                _write_all(fd, buf[:filled])
+                raise InterruptedError("download stopped")
+            n = raw.readinto(buf[filled:filled + CHUNK_SIZE])
+            if not n:
+                break
+            filled += n
+            if filled == WRITE_BATCH:
+                _write_all(fd, buf)
+                filled = 0
+        if filled:
+            _write_all(fd, buf[:filled])
+    finally:
+        os.close(fd)
+
+
+def _file_md5(filepath):
+    with open(filepath, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+, hashes straight from a large readinto buffer
+            return hashlib.file_digest(f, "md5").hexdigest()
+        digest = hashlib.md5()
+        for block in iter(lambda: f.read(WRITE_BATCH), b""):
+            digest.update(block)
+        return digest.hexdigest()
+
+
+_END_OF_POSTS = object()
+
+
+# Runs in a plain thread and never touches Qt: the GUI polls updates_queue, which holds
+# ("status", text), ("progress", current, total) and a final ("finished",)
+class DownloadEngine:
     def __init__(self, tags, user_id, api_key, download_dir, allowed_exts, translator):
-        super().__init__()
         self.tags = tags
         self.user_id = user_id
         self.api_key = api_key
         self.download_dir = download_dir
         self.allowed_exts = allowed_exts
+        self._ext_subdirs = {ext: subdir for ext, subdir in _EXT_TO_SUBDIR.items() if ext in allowed_exts}
         self.tr = translator
+        self._last_update = 0.0
+        self.updates_queue = queue.Queue()
+        self._total_count = None
+        self._fetch_error = None
+        self._stop = threading.Event()
+        self._executor = None
+
+        # One session for the whole run so API pages and files reuse keep-alive connections
+        self.session = requests.Session()
+        # raise_on_status=False hands the last response back so HTTP errors are still reported as before
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # post id -> size and md5 of what was saved, lets re-runs skip unchanged files without a request.
+        # Opened by run(); shared by the download threads, so every access goes through _index_lock
+        self.index = None
+        self._index_lock = threading.Lock()
+        self._index_pending = 0
+
+    def start(self):
+        # Daemon so the engine thread itself never holds up exit; the pool threads are
+        # joined at exit though, which is why the window calls stop() when it closes
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Called from the GUI thread: ends the run as soon as in-flight chunks are written.
+    # Partial files stay as .part and are resumed next time
+    def stop(self):
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def _status(self, text):
+        self.updates_queue.put(("status", text))
+
+    def _progress(self, current, total):
+        self.updates_queue.put(("progress", current, total))
 
     def run(self):
         try:
-            base_url = "https://gelbooru.com/index.php"
+            self._open_index()
             params_base = {
                 "page": "dapi",
                 "s": "post",
                 "q": "index",
-                "limit": 100,
+                "limit": PAGE_LIMIT,
                 "json": 1,
                 "tags": self.tags,
             }
@@ -45,137 +199,293 @@ class Worker(QThread):
             if self.api_key:
                 params_base["api_key"] = self.api_key
 
-            posts = []
-            total_count = 0
-            has_total = False
-            pid = 0
-            self.statusChanged.emit(self.tr["getting_posts"])
-            while True:
-                params = params_base.copy()
-                params["pid"] = pid
-                response = requests.get(base_url, params=params)
-                response_text = response.text.strip()[:200]
-                if response.status_code != 200:
-                    self.statusChanged.emit(self.tr["http_error"].format(response.status_code, response_text))
-                    return
-                if not response_text:
-                    self.statusChanged.emit(self.tr["empty_response"].format(response.status_code))
-                    return
-                try:
-                    data = response.json()
-                except ValueError as e:
-                    if "Missing authentication" in response_text or "login_required" in response_text.lower():
-                        self.statusChanged.emit(self.tr["json_error_auth"].format(response_text))
-                    else:
-                        self.statusChanged.emit(self.tr["json_error"].format(str(e), response_text))
-                    return
-                
-                # Handle both dict and list formats (GelBooru uses dict with "post")
-                if isinstance(data, list):
-                    new_posts = data
-                    success = True  # Assume success if list
-                elif isinstance(data, dict):
-                    success = data.get("success", True)
-                    if not success:
-                        msg = data.get('message', 'Неизвестная ошибка API')
-                        self.statusChanged.emit(self.tr["api_error"].format(msg))
-                        return
-                    new_posts = data.get("post", [])  # GelBooru uses "post", not "posts"
-                    if total_count == 0:
-                        attributes = data.get("@attributes", {})
-                        total_count = attributes.get("count", len(new_posts))
-                        has_total = True
-                else:
-                    self.statusChanged.emit(self.tr["unexpected_type"].format(type(data), response_text))
-                    return
-
-                posts.extend(new_posts)
-                current_count = len(posts)
-                if not has_total:
-                    total_str = self.tr["pagination_note"]
-                else:
-                    total_str = f" / {total_count}"
-                self.progressUpdated.emit(current_count, total_count if has_total else 0)
-                self.statusChanged.emit(self.tr["received_posts"].format(current_count, total_str))
-                if len(new_posts) < 100:
-                    break
-                pid += 1
-
-            if len(posts) == 0:
-                self.statusChanged.emit(self.tr["no_posts"])
-                return
+            # Create only the subfolders that can receive files, once per run
+            self._subdirs = {}
+            for subdir in set(self._ext_subdirs.values()):
+                self._subdirs[subdir] = os.path.join(self.download_dir, subdir)
+                os.makedirs(self._subdirs[subdir], exist_ok=True)
 
-            self.statusChanged.emit(self.tr["starting_download"])
+            # API pages are fetched on their own thread and streamed in here, so downloading
+            # starts with the first page instead of after the last one
+            self._status(self.tr["getting_posts"])
+            posts_queue = queue.Queue(maxsize=POST_QUEUE_SIZE)
+            threading.Thread(target=self._produce_posts, args=(params_base, posts_queue), daemon=True).start()
+
+            received = 0
             downloaded = 0
             processed = 0
-            total_posts = len(posts)
-            video_exts = {'.mp4', '.webm', '.avi', '.mov', '.swf'}
-            gif_ext = '.gif'
-            image_exts = {'.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tga'}
-            
-            for post in posts:
-                processed += 1
-                if not isinstance(post, dict):
-                    self.progressUpdated.emit(processed, total_posts)
-                    continue
-                url = post.get("file_url")
-                if not url:
-                    self.progressUpdated.emit(processed, total_posts)
-                    continue
-                post_id = post.get("id", "")
-                parsed_url = urlparse(url)
-                filename = os.path.basename(parsed_url.path)
-                if not filename or '.' not in filename:
-                    ext = os.path.splitext(parsed_url.path)[1] or ".jpg"
-                    filename = f"{post_id}{ext}"
-                else:
-                    # Clean filename
-                    filename = re.sub(r'[<>:"/\\|?*]', '_', f"{post_id}_{filename}")
-                ext = os.path.splitext(filename)[1].lower()
-                
-                if ext not in self.allowed_exts:
-                    self.progressUpdated.emit(processed, total_posts)
-                    continue
-                
-                # Determine subdir
-                if ext == gif_ext:
-                    subdir = "GIF"
-                elif ext in video_exts:
-                    subdir = "videos"
-                else:
-                    subdir = "images"
-                
-                subdir_path = os.path.join(self.download_dir, subdir)
-                os.makedirs(subdir_path, exist_ok=True)
-                filepath = os.path.join(subdir_path, filename)
-                
-                try:
-                    dl_headers = {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-                        "Referer": "https://gelbooru.com/",
-                    }
-                    dl_response = requests.get(url, stream=True, headers=dl_headers, timeout=30)
-                    dl_response.raise_for_status()
-                    content_type = dl_response.headers.get("Content-Type", "")
-                    if "text/html" in content_type or "application/json" in content_type:
-                        self.statusChanged.emit(self.tr["download_error"].format(url, f"Unexpected content-type: {content_type}"))
-                        self.progressUpdated.emit(processed, total_posts)
+            fetching = True
+            pending = set()
+            with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+                self._executor = executor
+                while (fetching or pending) and not self._stop.is_set():
+                    # Keep the pool fed without queueing more futures than it can work through
+                    while fetching and len(pending) < MAX_PENDING_DOWNLOADS:
+                        try:
+                            # Never block for good, stop() has to be noticed
+                            post = posts_queue.get(timeout=UPDATE_INTERVAL)
+                        except queue.Empty:
+                            break
+                        if post is _END_OF_POSTS:
+                            fetching = False
+                            break
+                        received += 1
+                        if received == 1:
+                            self._status(self.tr["starting_download"])
+                        target = self._target(post)
+                        if target is None:
+                            processed += 1  # Unwanted type, not worth a trip through the pool
+                            continue
+                        pending.add(executor.submit(self._download_one, post, *target))
+                    if not pending:
                         continue
-                    with open(filepath, 'wb') as f:
-                        for chunk in dl_response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                    downloaded += 1
-                    if processed % 10 == 0:
-                        self.statusChanged.emit(self.tr["processed_downloaded"].format(processed, total_posts, downloaded))
-                except Exception as e:
-                    self.statusChanged.emit(self.tr["download_error"].format(url, str(e)))
-                self.progressUpdated.emit(processed, total_posts)
-            
-            skipped = total_posts - downloaded
-            self.statusChanged.emit(self.tr["finished"].format(processed, total_posts, downloaded, skipped, self.download_dir))
+                    block = not fetching or len(pending) >= MAX_PENDING_DOWNLOADS
+                    done, pending = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+                    reported = False
+                    for future in done:
+                        if future.cancelled():
+                            continue  # Dropped by stop()
+                        processed_delta, downloaded_delta, status = future.result()
+                        processed += processed_delta
+                        downloaded += downloaded_delta
+                        if status:
+                            self._status(status)
+                            reported = True
+                    # Until the last page is in, the API count is the best known total
+                    total_posts = (self._total_count or 0) if fetching else received
+                    if done and self._update_due():
+                        self._progress(processed, total_posts)
+                        if not reported:
+                            self._status(self.tr["processed_downloaded"].format(processed, total_posts, downloaded))
+
+            if self._stop.is_set():
+                return
+            self._progress(processed, received)
+            if self._fetch_error:
+                # Whatever was fetched before the error has been downloaded, the error is what to show
+                self._status(self._fetch_error)
+                return
+            if received == 0:
+                self._status(self.tr["no_posts"])
+                return
+
+            skipped = received - downloaded
+            self._status(self.tr["finished"].format(processed, received, downloaded, skipped, self.download_dir))
+        except Exception as e:
+            self._status(self.tr["unexpected_error"].format(str(e)))
+        finally:
+            self._stop.set()
+            self.session.close()
+            with self._index_lock:
+                if self.index is not None:
+                    self.index.commit()
+                    self.index.close()
+            self.updates_queue.put(("finished",))
+
+    # Rate-limits progress updates to UPDATE_INTERVAL, the GUI can't show more anyway
+    def _update_due(self):
+        now = time.monotonic()
+        if now - self._last_update >= UPDATE_INTERVAL:
+            self._last_update = now
+            return True
+        return False
+
+    # Producer thread: pushes posts to the download loop, then _END_OF_POSTS
+    def _produce_posts(self, params_base, posts_queue):
+        pages = self._fetch_pages(params_base)
+        try:
+            for post in pages:
+                # Bounded put so a failed download loop can't leave this thread blocked forever
+                while True:
+                    if self._stop.is_set():
+                        return
+                    try:
+                        posts_queue.put(post, timeout=UPDATE_INTERVAL)
+                        break
+                    except queue.Full:
+                        pass
+        except Exception as e:
+            self._fetch_error = self.tr["unexpected_error"].format(str(e))
+        finally:
+            pages.close()  # Cancels page fetches still queued when stopping early
+            if not self._stop.is_set():
+                posts_queue.put(_END_OF_POSTS)
+
+    # Yields posts page by page, sets _total_count as soon as the API reports it and
+    # _fetch_error on failure
+    def _fetch_pages(self, params_base):
+        pid = 0
+        while True:
+            new_posts, count, error = self._fetch_page(params_base, pid)
+            if error:
+                self._fetch_error = error
+                return
+            if count is not None and self._total_count is None:
+                self._total_count = int(count)
+            yield from new_posts
+            if len(new_posts) < PAGE_LIMIT:
+                return
+            if self._total_count is not None:
+                break  # With a known total the rest is fetched concurrently below
+            pid += 1
+
+        remaining = range(pid + 1, math.ceil(self._total_count / PAGE_LIMIT))
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            try:
+                futures = [executor.submit(self._fetch_page, params_base, p) for p in remaining]
+                for future in as_completed(futures):
+                    new_posts, _, error = future.result()
+                    if error:
+                        self._fetch_error = error
+                        return
+                    yield from new_posts
+            finally:
+                # On error or early close, don't wait for pages nobody will read
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    # Fetches one API page without reporting, so it can run in any thread; returns (posts, total_count_or_none, error_or_none)
+    def _fetch_page(self, params_base, pid):
+        params = params_base.copy()
+        params["pid"] = pid
+        response = self.session.get(API_URL, params=params, timeout=30)
+        response_text = response.text.strip()[:200]
+        if response.status_code != 200:
+            return [], None, self.tr["http_error"].format(response.status_code, response_text)
+        if not response_text:
+            return [], None, self.tr["empty_response"].format(response.status_code)
+        try:
+            data = _json_loads(response.content)
+        except ValueError as e:
+            if "Missing authentication" in response_text or "login_required" in response_text.lower():
+                return [], None, self.tr["json_error_auth"].format(response_text)
+            return [], None, self.tr["json_error"].format(str(e), response_text)
+
+        # Handle both dict and list formats (GelBooru uses dict with "post")
+        if isinstance(data, list):
+            return data, None, None  # Assume success if list
+        if isinstance(data, dict):
+            success = data.get("success", True)
+            if not success:
+                msg = data.get('message', 'Неизвестная ошибка API')
+                return [], None, self.tr["api_error"].format(msg)
+            new_posts = data.get("post", [])  # GelBooru uses "post", not "posts"
+            attributes = data.get("@attributes", {})
+            return new_posts, attributes.get("count"), None
+        return [], None, self.tr["unexpected_type"].format(type(data), response_text)
+
+    # A locked or unwritable index only costs the skip, so the run goes on without one
+    def _open_index(self):
+        try:
+            index = sqlite3.connect(INDEX_PATH, check_same_thread=False)
+        except sqlite3.Error:
+            return
+        try:
+            index.execute("CREATE TABLE IF NOT EXISTS dl (id INTEGER PRIMARY KEY, size INTEGER, md5 TEXT)")
+        except sqlite3.Error:
+            index.close()
+            return
+        self.index = index
+
+    def _index_get(self, post_id):
+        if self.index is None:
+            return None
+        with self._index_lock:
+            return self.index.execute("SELECT size, md5 FROM dl WHERE id = ?", (post_id,)).fetchone()
+
+    def _index_put(self, post_id, size, md5):
+        if self.index is None or post_id == "" or not md5:
+            return
+        with self._index_lock:
+            self.index.execute("INSERT OR REPLACE INTO dl (id, size, md5) VALUES (?, ?, ?)", (post_id, size, md5))
+            self._index_pending += 1
+            if self._index_pending >= INDEX_COMMIT_EVERY:
+                self.index.commit()
+                self._index_pending = 0
+
+    # Decides where a post goes, returns (url, filepath) or None if it's not a wanted file
+    def _target(self, post):
+        if not isinstance(post, dict):
+            return None
+        url = post.get("file_url")
+        if not url:
+            return None
+        # file_url is always a plain CDN URL, so string ops are enough to get the name
+        filename = url.rsplit('/', 1)[-1].split('?', 1)[0]
+        dot = filename.rfind('.')
+        if dot < 0:
+            ext = ".jpg"
+        else:
+            ext = filename[dot:].lower() if dot else ''  # ".hidden" has no extension, as with splitext
+
+        # One lookup both filters by allowed type and picks the subdir, before any name cleaning
+        subdir = self._ext_subdirs.get(ext)
+        if subdir is None:
+            return None
+
+        post_id = post.get("id", "")
+        if dot < 0:
+            filename = f"{post_id}{ext}"
+        else:
+            # Clean filename
+            filename = _INVALID_FN.sub('_', f"{post_id}_{filename}")
+        return url, os.path.join(self._subdirs[subdir], filename)
+
+    # Runs in a pool thread; returns (processed_delta, downloaded_delta, status_or_none)
+    def _download_one(self, post, url, filepath, retried=False):
+        post_id = post.get("id", "")
+
+        try:
+            md5 = post.get("md5")
+            try:
+                existing = os.path.getsize(filepath)
+            except OSError:
+                existing = 0
+            if existing:
+                if md5 and self._index_get(post_id) == (existing, md5):
+                    return 1, 0, None  # Same post, same file as last time: no request at all
+                # Only completed downloads get the final name, but files saved before the
+                # index existed still need their size (and md5 when known) checked
+                head = self.session.head(url, headers=DOWNLOAD_HEADERS, timeout=30, allow_redirects=True)
+                if head.ok and head.headers.get("Content-Length") == str(existing):
+                    if not md5 or _file_md5(filepath) == md5.lower():
+                        self._index_put(post_id, existing, md5)
+                        return 1, 0, None
+
+            # Data goes to .part until it's complete and verified, so an interrupted run
+            # leaves something to resume instead of a file that looks finished
+            part_path = filepath + ".part"
+            try:
+                resume_from = os.path.getsize(part_path)
+            except OSError:
+                resume_from = 0
+            dl_headers = DOWNLOAD_HEADERS
+            if resume_from:
+                dl_headers = {**DOWNLOAD_HEADERS, "Range": f"bytes={resume_from}-"}
+            dl_response = self.session.get(url, stream=True, headers=dl_headers, timeout=30)
+            if dl_response.status_code == 416:
+                # Partial file doesn't fit the remote one, fetch it whole
+                dl_response.close()
+                dl_response = self.session.get(url, stream=True, headers=DOWNLOAD_HEADERS, timeout=30)
+            # Streamed responses hold their pool connection until closed, so close on every path
+            with dl_response:
+                dl_response.raise_for_status()
+                content_type = dl_response.headers.get("Content-Type", "")
+                if "text/html" in content_type or "application/json" in content_type:
+                    return 1, 0, self.tr["download_error"].format(url, f"Unexpected content-type: {content_type}")
+                # Let urllib3 undo any Content-Encoding, same as iter_content did
+                dl_response.raw.decode_content = True
+                # 206 continues the partial file, a plain 200 rewrites it from scratch
+                _save_stream(dl_response.raw, part_path, append=dl_response.status_code == 206, stop=self._stop)
+            if md5 and _file_md5(part_path) != md5.lower():
+                os.unlink(part_path)
+                if not retried:
+                    return self._download_one(post, url, filepath, retried=True)
+                return 1, 0, self.tr["hash_mismatch"].format(url)
+            os.replace(part_path, filepath)
+            self._index_put(post_id, os.path.getsize(filepath), md5)
+            return 1, 1, None
         except Exception as e:
-            self.statusChanged.emit(self.tr["unexpected_error"].format(str(e)))
+            return 1, 0, self.tr["download_error"].format(url, str(e))
 
 
 class MainWindow(QWidget):
@@ -194,7 +504,8 @@ class MainWindow(QWidget):
             self.languages = ["en"]  # Fallback
 
         self.current_lang = "en"  # Default
-        self.translator = self.load_translator(self.current_lang)
+        self._translations = self.load_translations()
+        self.translator = self._translations.get(self.current_lang) or self._translations["en"]
 
         self.setWindowTitle(self.translator["title"])
         self.setWindowIcon(QIcon("icon.png"))
@@ -274,18 +585,26 @@ class MainWindow(QWidget):
         self.status_label = QLabel()
         layout.addWidget(self.status_label)
 
+        # Polls the download engine while it runs
+        self.update_timer = QTimer(self)
+        self.update_timer.setInterval(DRAIN_INTERVAL_MS)
+        self.update_timer.timeout.connect(self._drain_updates)
+
         self.update_ui()
 
-    def load_translator(self, lang):
-        path = f"locales/{lang}.json"
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return self.load_translator("en")  # Fallback to en
+    def load_translations(self):
+        # Read every locale once so switching language never touches the disk
+        translations = {}
+        for lang in self.languages:
+            path = f"locales/{lang}.json"
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    translations[lang] = _json_loads(f.read())
+        return translations
 
     def change_language(self, lang):
         self.current_lang = lang
-        self.translator = self.load_translator(lang)
+        self.translator = self._translations.get(lang) or self._translations["en"]  # Fallback to en
         self.update_ui()
         self.setWindowTitle(self.translator["title"])
 
@@ -325,11 +644,11 @@ class MainWindow(QWidget):
         # Allowed exts
         allowed_exts = set()
         if self.images_cb.isChecked():
-            allowed_exts.update({'.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tga'})
+            allowed_exts.update(IMAGE_EXTS)
         if self.gif_cb.isChecked():
-            allowed_exts.add('.gif')
+            allowed_exts.update(GIF_EXTS)
         if self.video_cb.isChecked():
-            allowed_exts.update({'.mp4', '.webm', '.avi', '.mov', '.swf'})
+            allowed_exts.update(VIDEO_EXTS)
         if not allowed_exts:
             self.status_label.setText(self.translator["select_file_type_error"])
             return
@@ -349,11 +668,32 @@ class MainWindow(QWidget):
         self.progress.setVisible(True)
         self.progress.setValue(0)
 
-        self.worker = Worker(tags, user_id, api_key, download_dir, allowed_exts, self.translator)
-        self.worker.statusChanged.connect(self.status_label.setText)
-        self.worker.progressUpdated.connect(self.update_progress)
-        self.worker.finished.connect(self.on_finished)
-        self.worker.start()
+        self.engine = DownloadEngine(tags, user_id, api_key, download_dir, allowed_exts, self.translator)
+        self.engine.start()
+        self.update_timer.start()
+
+    def _drain_updates(self):
+        # Only the latest status/progress of a tick is visible, so apply just those
+        status = progress = None
+        finished = False
+        for _ in range(MAX_UPDATES_PER_DRAIN):
+            try:
+                update = self.engine.updates_queue.get_nowait()
+            except queue.Empty:
+                break
+            if update[0] == "status":
+                status = update[1]
+            elif update[0] == "progress":
+                progress = update[1:]
+            else:
+                finished = True
+        if status is not None:
+            self.status_label.setText(status)
+        if progress is not None:
+            self.update_progress(*progress)
+        if finished:
+            self.update_timer.stop()
+            self.on_finished()
 
     def update_progress(self, current, total):
         if total > 0:
@@ -367,6 +707,14 @@ class MainWindow(QWidget):
         self.progress.setVisible(False)
         self.progress.setRange(0, 100)  # Reset
 
+    def closeEvent(self, event):
+        if self.update_timer.isActive():
+            self.update_timer.stop()
+            self.engine.stop()
+            # The engine thread is a daemon, so without the join its final index commit could be cut off
+            self.engine.thread.join(STOP_TIMEOUT)
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)